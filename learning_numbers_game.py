@@ -2,11 +2,22 @@
 
 import os
 import io
+import gc
+import sys
+import json
+import time
+import wave
+import hashlib
+import tracemalloc
+import bisect
+import argparse
 import pygame
 import random
 import math
 import numpy as np
-from typing import Optional, Tuple
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Optional, Tuple
 from gtts import gTTS
 
 # --- Global Constants and Configuration ---
@@ -32,10 +43,43 @@ COLORS = {
 }
 BALL_COLORS = [COLORS["red"], COLORS["green"], COLORS["blue"], COLORS["yellow"], COLORS["white"], COLORS["lightyellow"], COLORS["darkred"], COLORS["darkgreen"], COLORS["darkblue"], COLORS["darkgray"]]
 NUMBERS = {1: "one", 2: "two", 3: "three", 4: "four", 5: "five", 6: "six", 7: "seven", 8: "eight", 9: "nine", 10: "ten"}
+FEEDBACK_PHRASES = ("point_to", "good_job", "no_good", "good", "you_did_it", "welcome")
+VOICE_TEXT = {
+    "en": {
+        "numbers": NUMBERS, "number": "number {}", "ball": "{} ball", "balls": "{} balls",
+        "point_to": "point to", "good_job": "good job", "no_good": "no good", "good": "good",
+        "you_did_it": "you did it", "welcome": "Welcome to Learning Numbers Game!"
+    },
+    "es": {
+        "numbers": {1: "uno", 2: "dos", 3: "tres", 4: "cuatro", 5: "cinco", 6: "seis", 7: "siete", 8: "ocho", 9: "nueve", 10: "diez"},
+        "number": "número {}", "ball": "una pelota", "balls": "{} pelotas",
+        "point_to": "señala", "good_job": "¡buen trabajo!", "no_good": "no es correcto", "good": "¡bien!",
+        "you_did_it": "¡lo lograste!", "welcome": "¡Bienvenido al juego de aprender números!"
+    },
+    "th": {
+        "numbers": {1: "หนึ่ง", 2: "สอง", 3: "สาม", 4: "สี่", 5: "ห้า", 6: "หก", 7: "เจ็ด", 8: "แปด", 9: "เก้า", 10: "สิบ"},
+        "number": "เลข{}", "ball": "ลูกบอล{}ลูก", "balls": "ลูกบอล{}ลูก",
+        "point_to": "ชี้ที่", "good_job": "เก่งมาก", "no_good": "ยังไม่ถูก", "good": "ถูกต้อง",
+        "you_did_it": "ทำได้แล้ว", "welcome": "ยินดีต้อนรับสู่เกมเรียนรู้ตัวเลข"
+    },
+}
+VOICE_PACK_DIR = "assets/voice_packs"
+VOICE_PACK_FORMAT = 1
+VOICE_PACK_AUDIO = {"sample_rate": 44100, "channels": 1, "target_dbfs": -20.0, "gate_dbfs": -50.0}
 FONT_SETTINGS = ("arial", 36)
 LARGE_FONT_SETTINGS = ("arial", 84)
 EXTRA_LARGE_FONT_SETTINGS = ("arial", 120)
-ANIMATION = {"hover_scale": 1.2, "ball_speed": 3, "transition_speed": 2.0, "feedback_speed": 5.0}
+ANIMATION = {"hover_scale": 1.2, "ball_speed": 3, "ball_speed_fps": 20, "transition_speed": 2.0, "feedback_speed": 5.0} # ball_speed is pixels per frame at ball_speed_fps
+LATENCY_BUCKETS_MS = (4, 8, 16, 33, 50, 67, 100, 150, 250)
+UNDECIDED_TAPS = {
+    "missed": "taps that missed every option",
+    "ignored": "taps on an option while a sound played or after the answer",
+    "inactive": "taps on the Next Level screen",
+}
+RENDERER_BACKENDS = ("surface", "texture", "texture-software")
+TEXTURE_CACHE_SIZE = 256
+SOAK_GROWTH_LIMITS = {"traced_kb": 0.05, "rss_kb": 1.0, "gc_objects": 0.05} # per round
+SOAK_MIN_SAMPLES = 3
 
 # --- Helper Functions ---
 def toggle_fullscreen(screen, screen_width, screen_height, fullscreen):
@@ -48,15 +92,335 @@ def toggle_fullscreen(screen, screen_width, screen_height, fullscreen):
     fullscreen = not is_fullscreen
     return fullscreen, screen
 
-def generate_speech_sound(text):
+def get_press_position(event):
+    """Returns the screen position of a mouse press or finger tap, or None for any other event.
+
+    FINGERDOWN also comes from indirect devices such as trackpads, in device coordinates. SDL only
+    synthesizes a mouse press (with touch=True) for direct touchscreens, so that press is the tap.
+    """
+    if event.type == pygame.MOUSEBUTTONDOWN:
+        return event.pos
+    return None
+
+def generate_speech_sound(text, lang='en'):
     """Generates and returns a Pygame sound object from text using gTTS."""
     buffer = io.BytesIO()
-    tts = gTTS(text=text, lang='en')
+    tts = gTTS(text=text, lang=lang)
     tts.write_to_fp(buffer)
     buffer.seek(0)
     sound = pygame.mixer.Sound(buffer)
     return sound
 
+def get_rss_kb() -> Optional[float]:
+    """Returns the resident set size of this process in KB, or None where it can't be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current RSS here, which still shows steady growth
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / 1024 if sys.platform == "darwin" else max_rss
+
+# --- Voice packs ---
+def number_phrase_ids(n: int) -> Tuple[str, str]:
+    """Returns the phrase ids for "number <n>" and "<n> ball(s)", e.g. ("number_two", "two_balls")."""
+    name = NUMBERS[n]
+    return f"number_{name}", f"{name}_ball" if n == 1 else f"{name}_balls"
+
+def phrase_catalogue(lang: str) -> Dict[str, str]:
+    """Returns the text of every spoken phrase in a language, keyed by phrase id (e.g. "number_one", "two_balls")."""
+    words = VOICE_TEXT[lang]
+    catalogue = {}
+    for n in NUMBERS:
+        number_id, balls_id = number_phrase_ids(n)
+        catalogue[number_id] = words["number"].format(words["numbers"][n])
+        catalogue[balls_id] = (words["ball"] if n == 1 else words["balls"]).format(words["numbers"][n])
+    for phrase_id in FEEDBACK_PHRASES:
+        catalogue[phrase_id] = words[phrase_id]
+    return catalogue
+
+def wav_bytes(samples: np.ndarray, sample_rate: int, channels: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.astype(np.int16).tobytes())
+    return buffer.getvalue()
+
+def normalize_loudness(samples: np.ndarray, target_dbfs: float, gate_dbfs: float) -> np.ndarray:
+    """Scales 16-bit samples so the RMS of the non-silent part hits target_dbfs, backing off if peaks would clip."""
+    audio = samples.astype(np.float64)
+    voiced = audio[np.abs(audio) > 32767 * 10 ** (gate_dbfs / 20)]
+    if not voiced.size:
+        return samples
+    gain = 32767 * 10 ** (target_dbfs / 20) / np.sqrt(np.mean(voiced ** 2))
+    gain = min(gain, 32767 / np.max(np.abs(voiced)))
+    return np.clip(np.round(audio * gain), -32768, 32767).astype(np.int16)
+
+class GTTSBackend:
+    """Google Translate speech through gTTS. Needs network access."""
+    version = "1"
+
+    def synthesize(self, text: str, lang: str) -> bytes:
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang).write_to_fp(buffer)
+        return buffer.getvalue()
+
+class ToneBackend:
+    """Offline stand-in for a speech engine: a tone whose pitch, level and length depend on the text."""
+    version = "1"
+
+    def synthesize(self, text: str, lang: str) -> bytes:
+        digest = hashlib.sha256(f"{lang}:{text}".encode()).digest()
+        sample_rate = VOICE_PACK_AUDIO["sample_rate"]
+        t = np.arange(int(sample_rate * (0.2 + 0.04 * len(text)))) / sample_rate
+        amplitude = 0.05 + 0.9 * digest[1] / 255
+        samples = np.sin(2 * math.pi * (220 + 2 * digest[0]) * t) * amplitude * 32767
+        return wav_bytes(samples, sample_rate, 1)
+
+TTS_BACKENDS = {"gtts": GTTSBackend, "tone": ToneBackend}
+
+def _init_voice_worker():
+    # Decoding goes through SDL_mixer, which needs an (unplayed) audio device
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pygame.mixer.init(VOICE_PACK_AUDIO["sample_rate"], -16, VOICE_PACK_AUDIO["channels"])
+
+def _synthesize_phrase(backend_name: str, lang: str, text: str) -> bytes:
+    """Runs in a pool worker: synthesizes one phrase and returns it as loudness-normalized WAV."""
+    audio = TTS_BACKENDS[backend_name]().synthesize(text, lang)
+    samples = pygame.sndarray.array(pygame.mixer.Sound(io.BytesIO(audio)))
+    samples = normalize_loudness(samples, VOICE_PACK_AUDIO["target_dbfs"], VOICE_PACK_AUDIO["gate_dbfs"])
+    return wav_bytes(samples, VOICE_PACK_AUDIO["sample_rate"], VOICE_PACK_AUDIO["channels"])
+
+def _phrase_digest(backend_name: str, lang: str, text: str) -> str:
+    # Anything that changes the output file is part of the digest, so changing it rebuilds the phrase
+    recipe = [VOICE_PACK_FORMAT, backend_name, TTS_BACKENDS[backend_name].version, lang, text, VOICE_PACK_AUDIO]
+    return hashlib.sha256(json.dumps(recipe, sort_keys=True).encode()).hexdigest()
+
+def read_voice_manifest(directory: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def _write_atomically(path: str, data: bytes):
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(data)
+    os.replace(f"{path}.tmp", path)
+
+def build_voice_packs(languages, backend_name: str = "gtts", root: str = VOICE_PACK_DIR, workers: Optional[int] = None) -> Dict[str, dict]:
+    """Builds or updates one voice pack per language, synthesizing only new or changed phrases.
+
+    Phrases of all languages are synthesized in parallel on a process pool. A pack's version goes up
+    whenever its contents change. Returns the per-language counts of built, kept, removed and failed phrases.
+    """
+    packs = {}
+    jobs = {}
+    for lang in languages:
+        directory = os.path.join(root, lang)
+        os.makedirs(directory, exist_ok=True)
+        old = read_voice_manifest(directory) or {"version": 0, "phrases": {}}
+        catalogue = phrase_catalogue(lang)
+        phrases = {}
+        for phrase_id, text in catalogue.items():
+            entry = {"text": text, "backend": backend_name, "hash": _phrase_digest(backend_name, lang, text), "file": f"{phrase_id}.wav"}
+            previous = old["phrases"].get(phrase_id)
+            if previous and previous["hash"] == entry["hash"] and os.path.exists(os.path.join(directory, entry["file"])):
+                phrases[phrase_id] = previous
+            else:
+                jobs[(lang, phrase_id)] = entry
+        packs[lang] = {"directory": directory, "old": old, "phrases": phrases, "stale": old["phrases"].keys() - catalogue.keys()}
+
+    summary = {lang: {"built": 0, "kept": len(pack["phrases"]), "removed": 0, "failed": 0} for lang, pack in packs.items()}
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_voice_worker) as pool:
+            futures = {pool.submit(_synthesize_phrase, backend_name, lang, entry["text"]): (lang, phrase_id) for (lang, phrase_id), entry in jobs.items()}
+            for future in as_completed(futures):
+                lang, phrase_id = futures[future]
+                entry = jobs[(lang, phrase_id)]
+                try:
+                    data = future.result()
+                except Exception as e:
+                    # The previous recording, if any, stays in the pack and the next build retries the phrase
+                    print(f"Failed to synthesize {lang}/{phrase_id}: {e}")
+                    summary[lang]["failed"] += 1
+                    previous = packs[lang]["old"]["phrases"].get(phrase_id)
+                    if previous and os.path.exists(os.path.join(packs[lang]["directory"], previous["file"])):
+                        packs[lang]["phrases"][phrase_id] = previous
+                    continue
+                _write_atomically(os.path.join(packs[lang]["directory"], entry["file"]), data)
+                packs[lang]["phrases"][phrase_id] = entry
+                summary[lang]["built"] += 1
+
+    for lang, pack in packs.items():
+        old = pack["old"]
+        for phrase_id in pack["stale"]:
+            try:
+                os.remove(os.path.join(pack["directory"], old["phrases"][phrase_id]["file"]))
+            except FileNotFoundError:
+                pass
+            summary[lang]["removed"] += 1
+        changed = summary[lang]["built"] or pack["phrases"] != old["phrases"]
+        manifest = {
+            "format": VOICE_PACK_FORMAT,
+            "language": lang,
+            "version": old["version"] + 1 if changed else old["version"],
+            "audio": VOICE_PACK_AUDIO,
+            "phrases": dict(sorted(pack["phrases"].items())),
+        }
+        _write_atomically(os.path.join(pack["directory"], "manifest.json"), json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8"))
+        summary[lang]["version"] = manifest["version"]
+    return summary
+
+class VoicePack:
+    """A built voice pack for one language."""
+    def __init__(self, lang: str, root: str = VOICE_PACK_DIR):
+        self.lang = lang
+        self.directory = os.path.join(root, lang)
+        self.manifest = read_voice_manifest(self.directory)
+        if self.manifest is None:
+            raise SystemExit(f"Missing voice pack {self.directory}, build it with --build-voice-packs {lang}")
+        if self.manifest.get("format") != VOICE_PACK_FORMAT:
+            raise SystemExit(f"Voice pack {self.directory} has format {self.manifest.get('format')}, expected {VOICE_PACK_FORMAT}")
+
+    def path(self, phrase_id: str) -> str:
+        entry = self.manifest["phrases"].get(phrase_id)
+        if entry is None:
+            raise FileNotFoundError(f"{phrase_id} is not in voice pack {self.directory}")
+        return os.path.join(self.directory, entry["file"])
+
+# --- Renderers ---
+class SurfaceRenderer:
+    """Draws with software blits onto the display surface."""
+    def __init__(self, size: Tuple[int, int], title: str):
+        # self.screen = pygame.display.set_mode(size, pygame.FULLSCREEN)
+        self.screen = pygame.display.set_mode(size)
+        pygame.display.set_caption(title)
+        self.fullscreen = bool(self.screen.get_flags() & pygame.FULLSCREEN)
+
+    def get_size(self) -> Tuple[int, int]:
+        return self.screen.get_size()
+
+    def toggle_fullscreen(self) -> bool:
+        width, height = self.screen.get_size()
+        self.fullscreen, self.screen = toggle_fullscreen(self.screen, width, height, self.fullscreen)
+        return self.fullscreen
+
+    def clear(self, color):
+        self.screen.fill(color)
+
+    def draw_rect(self, color, rect: pygame.Rect, width: int = 0, border_radius: int = 0):
+        pygame.draw.rect(self.screen, color, rect, width, border_radius=border_radius)
+
+    def fill_alpha(self, color, alpha: int, rect: pygame.Rect):
+        overlay = pygame.Surface(rect.size, pygame.SRCALPHA)
+        overlay.fill((*color[:3], alpha))
+        self.screen.blit(overlay, rect.topleft)
+
+    def render_text(self, font: pygame.font.Font, text: str, color) -> pygame.Surface:
+        return font.render(text, True, color)
+
+    def blit(self, image: pygame.Surface, dest):
+        self.screen.blit(image, dest)
+
+    def draw_cached(self, key, build, rect: pygame.Rect):
+        """Draws the surface returned by build() scaled into rect. The surface is rebuilt on every call."""
+        image = build()
+        if image.get_size() != rect.size:
+            image = pygame.transform.smoothscale(image, rect.size)
+        self.screen.blit(image, rect)
+
+    def present(self):
+        pygame.display.flip()
+
+class TextureRenderer:
+    """Draws with pygame._sdl2 textures that are uploaded once and then scaled and blended by SDL."""
+    def __init__(self, size: Tuple[int, int], title: str, software: bool = False):
+        # pygame._sdl2 is experimental, so only the texture backend depends on it
+        from pygame._sdl2 import video as sdl2_video
+        self.video = sdl2_video
+        self.window = sdl2_video.Window(title, size=size)
+        self.renderer = sdl2_video.Renderer(self.window, accelerated=0 if software else -1)
+        # Keep drawing in game coordinates whatever the window size is
+        self.renderer.logical_size = size
+        self.renderer.draw_blend_mode = pygame.BLENDMODE_BLEND
+        self.fullscreen = False
+        self.textures = {}
+
+    def get_size(self) -> Tuple[int, int]:
+        return self.renderer.logical_size
+
+    def toggle_fullscreen(self) -> bool:
+        if self.fullscreen:
+            self.window.set_windowed()
+        else:
+            self.window.set_fullscreen()
+        self.fullscreen = not self.fullscreen
+        return self.fullscreen
+
+    def _cached_texture(self, key, build):
+        # Least recently used textures are dropped once the cache is full
+        texture = self.textures.pop(key, None)
+        if texture is None:
+            texture = self.video.Texture.from_surface(self.renderer, build())
+            if len(self.textures) >= TEXTURE_CACHE_SIZE:
+                del self.textures[next(iter(self.textures))]
+        self.textures[key] = texture
+        return texture
+
+    def clear(self, color):
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.clear()
+
+    def draw_rect(self, color, rect: pygame.Rect, width: int = 0, border_radius: int = 0):
+        if width == 0 and border_radius <= 0:
+            self.renderer.draw_color = pygame.Color(color)
+            self.renderer.fill_rect(rect)
+            return
+
+        def build():
+            image = pygame.Surface(rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(image, color, image.get_rect(), width, border_radius=border_radius)
+            return image
+        self._cached_texture(("rect", rect.size, tuple(color), width, border_radius), build).draw(dstrect=rect)
+
+    def fill_alpha(self, color, alpha: int, rect: pygame.Rect):
+        self.renderer.draw_color = (*color[:3], alpha)
+        self.renderer.fill_rect(rect)
+
+    def render_text(self, font: pygame.font.Font, text: str, color):
+        # The font object is part of the key so its id can't be reused by another font while cached
+        return self._cached_texture(("text", font, text, tuple(color)), lambda: font.render(text, True, color))
+
+    def blit(self, image, dest):
+        if isinstance(image, pygame.Surface):
+            image = self.video.Texture.from_surface(self.renderer, image)
+        if len(dest) == 2:
+            dest = pygame.Rect(dest, (image.width, image.height))
+        image.draw(dstrect=dest)
+
+    def draw_cached(self, key, build, rect: pygame.Rect):
+        """Draws the texture cached under key scaled into rect, uploading the surface from build() on a miss."""
+        self._cached_texture(key, build).draw(dstrect=rect)
+
+    def present(self):
+        self.renderer.present()
+
+def create_renderer(backend: str, size: Tuple[int, int], title: str):
+    """Creates the renderer for one of RENDERER_BACKENDS."""
+    if backend == "surface":
+        return SurfaceRenderer(size, title)
+    elif backend in ("texture", "texture-software"):
+        return TextureRenderer(size, title, software=backend == "texture-software")
+    raise ValueError(f"Unknown renderer backend: {backend}")
+
 class Button:
     """Button UI element."""
     def __init__(self, x, y, text, width=200, height=50, color=COLORS["darkgreen"]):
@@ -69,11 +433,11 @@ class Button:
         self.text = text
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
 
-    def draw(self, screen, font):
-        pygame.draw.rect(screen, self.color, self.rect)
-        rendered_text = font.render(self.text, True, self.text_color)
+    def draw(self, renderer, font):
+        renderer.draw_rect(self.color, self.rect)
+        rendered_text = renderer.render_text(font, self.text, self.text_color)
         text_rect = rendered_text.get_rect(center=self.rect.center) # Center the text in the button
-        screen.blit(rendered_text, text_rect)
+        renderer.blit(rendered_text, text_rect)
 
     def is_clicked(self, pos):
         return self.rect.collidepoint(pos)
@@ -93,6 +457,103 @@ class GameState:
     current_music: str = ""
     update_music: bool = False
 
+class LatencyHistogram:
+    """Counts latency samples into fixed millisecond buckets."""
+    def __init__(self, edges: Tuple[int, ...] = LATENCY_BUCKETS_MS):
+        self.edges = edges
+        self.counts = [0] * (len(edges) + 1)
+        self.samples = 0
+        self.total_ms = 0.0
+        self.worst_ms = 0.0
+
+    def add(self, ms: float):
+        self.counts[bisect.bisect_left(self.edges, ms)] += 1
+        self.samples += 1
+        self.total_ms += ms
+        self.worst_ms = max(self.worst_ms, ms)
+
+    def format(self, name: str) -> str:
+        if not self.samples:
+            return f"{name}: no samples"
+        lines = [f"{name}: {self.samples} taps, mean {self.total_ms / self.samples:.1f} ms, worst {self.worst_ms:.1f} ms"]
+        lower = 0
+        for edge, count in zip(self.edges + (None,), self.counts):
+            label = f"{lower:>4}-{edge:<4} ms" if edge is not None else f"{lower:>4}+     ms"
+            lines.append(f"  {label} {count:6d} {'#' * round(40 * count / self.samples)}")
+            lower = edge
+        return "\n".join(lines)
+
+class LatencyTracer:
+    """Traces each tap from event creation, through the answer decision, to the first flip showing the highlight."""
+    def __init__(self):
+        self.histograms = {
+            "event -> dequeue": LatencyHistogram(),
+            "dequeue -> decision": LatencyHistogram(),
+            "decision -> flip": LatencyHistogram(),
+            "event -> flip": LatencyHistogram(),
+        }
+        self.current = None
+        self.pending = []
+        self.undecided = Counter()
+        self.untimed = 0
+        self.bounded = 0
+        self.previous_poll = None
+        self.last_poll = None
+
+    def polled(self):
+        """Marks a poll of the event queue; events read now were created after the previous poll."""
+        self.previous_poll, self.last_poll = self.last_poll, time.perf_counter()
+
+    def begin(self, event):
+        now = time.perf_counter()
+        self.current = {"dequeue": now}
+        # SDL stamps events in milliseconds since init, but not every pygame build exposes it
+        timestamp = getattr(event, "timestamp", None)
+        if timestamp is not None:
+            self.current["event"] = now - max(pygame.time.get_ticks() - timestamp, 0) / 1000
+        elif self.previous_poll is not None:
+            # The event was queued at the earliest right after the previous poll
+            self.current["event"] = self.previous_poll
+            self.bounded += 1
+        else:
+            self.untimed += 1
+
+    def decide(self):
+        if self.current is not None and "decision" not in self.current:
+            self.current["decision"] = time.perf_counter()
+            self.pending.append(self.current)
+
+    def end(self, outcome: str):
+        """Closes the current tap; outcome is the UNDECIDED_TAPS key that applies if no decision was made."""
+        if self.current is not None and "decision" not in self.current:
+            self.undecided[outcome] += 1
+        self.current = None
+
+    def presented(self):
+        if not self.pending:
+            return
+        now = time.perf_counter()
+        for trace in self.pending:
+            if "event" in trace:
+                self.histograms["event -> dequeue"].add((trace["dequeue"] - trace["event"]) * 1000)
+                self.histograms["event -> flip"].add((now - trace["event"]) * 1000)
+            self.histograms["dequeue -> decision"].add((trace["decision"] - trace["dequeue"]) * 1000)
+            self.histograms["decision -> flip"].add((now - trace["decision"]) * 1000)
+        self.pending = []
+
+    def report(self) -> str:
+        lines = ["--- Input latency ---"]
+        for name, histogram in self.histograms.items():
+            if name.startswith("event") and not histogram.samples and self.untimed:
+                lines.append(f"{name}: event time unavailable on this pygame build")
+            elif name.startswith("event") and self.bounded:
+                lines.append(histogram.format(f"{name} (upper bound, from the previous event poll)"))
+            else:
+                lines.append(histogram.format(name))
+        for outcome, label in UNDECIDED_TAPS.items():
+            lines.append(f"{label}: {self.undecided[outcome]}")
+        return "\n".join(lines)
+
 class NumberOption:
     def __init__(self, number: int):
         self.number = number
@@ -108,20 +569,12 @@ class NumberOption:
         self.visible = True
         self.visible_end_time = None
 
-    def update(self):
+    def update(self, delta: float):
         accel_factor = self.accel_factor
 
-    def draw(self, surface: pygame.Surface, position: Tuple[int, int]) -> pygame.Rect:
+    def _build_tile(self) -> pygame.Surface:
         container = pygame.Surface((300, 300), pygame.SRCALPHA)
-        
-        if not self.visible:
-            # return None
-            if self.visible_end_time is None:
-                self.visible_end_time = pygame.time.get_ticks()
-            self.visible_end_elapse = pygame.time.get_ticks() - self.visible_end_time
-            if self.visible_end_elapse > 1000:
-                return None
-        
+
         # Draw rectangle
         if self.highlight_good:
             pygame.draw.rect(container, COLORS["darkgreen"], (0, 0, 300, 300), border_radius=10)
@@ -135,12 +588,22 @@ class NumberOption:
         # Blit text
         self.text_image = self.extra_large_font.render(str(self.number), True, COLORS["white"])
         container.blit(self.text_image, (150 - self.text_image.get_width() // 2, 150 - self.text_image.get_height() // 2))
+        return container
+
+    def draw(self, renderer, position: Tuple[int, int]) -> pygame.Rect:
+        if not self.visible:
+            # return None
+            if self.visible_end_time is None:
+                self.visible_end_time = pygame.time.get_ticks()
+            self.visible_end_elapse = pygame.time.get_ticks() - self.visible_end_time
+            if self.visible_end_elapse > 1000:
+                return None
         
         # Scale and position
         scaled_size = int(300 * self.scale)
-        scaled_img = pygame.transform.smoothscale(container, (scaled_size, scaled_size))        
-        self.rect = scaled_img.get_rect(center=(position[0] + 150, position[1] + 150))
-        surface.blit(scaled_img, self.rect)
+        self.rect = pygame.Rect(0, 0, scaled_size, scaled_size)
+        self.rect.center = (position[0] + 150, position[1] + 150)
+        renderer.draw_cached(("number_tile", self.number, self.highlight_good, self.highlight_bad), self._build_tile, self.rect)
         return self.rect
 
 class Ball:
@@ -174,19 +637,28 @@ class Ball:
         self.dx = math.cos(move_angle) * ANIMATION["ball_speed"]
         self.dy = math.sin(move_angle) * ANIMATION["ball_speed"]
 
-    def update(self):
+    def update(self, delta: float):
         # Keep within bounds (40px padding)
-        self.x += self.dx * self.accel_factor
-        self.y += self.dy * self.accel_factor
+        frames = delta * ANIMATION["ball_speed_fps"]
+        self.x += self.dx * self.accel_factor * frames
+        self.y += self.dy * self.accel_factor * frames
         
         if self.x <= 30 or self.x >= self.bounds[0]-90:
             self.dx *= -1
         if self.y <= 30 or self.y >= self.bounds[1]-90:
             self.dy *= -1
 
-    def draw(self, surface: pygame.Surface):
-        pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), self.radius)
-        pygame.draw.circle(surface, COLORS["black"], (int(self.x), int(self.y)), self.radius, 2)
+    def _build_image(self) -> pygame.Surface:
+        image = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(image, self.color, (self.radius, self.radius), self.radius)
+        pygame.draw.circle(image, COLORS["black"], (self.radius, self.radius), self.radius, 2)
+        return image
+
+    def draw(self, renderer, origin: Tuple[int, int], scale: float = 1.0):
+        size = int(self.radius * 2 * scale)
+        rect = pygame.Rect(0, 0, size, size)
+        rect.center = (origin[0] + int(self.x * scale), origin[1] + int(self.y * scale))
+        renderer.draw_cached(("ball", self.color, self.radius), self._build_image, rect)
 
 class BallOption:
     def __init__(self, number: int):
@@ -198,22 +670,14 @@ class BallOption:
         self.visible = True
         self.visible_end_time = None
 
-    def update(self):
+    def update(self, delta: float):
         for b in self.balls:
             b.accel_factor = self.accel_factor
-            b.update()
+            b.update(delta)
 
-    def draw(self, surface: pygame.Surface, position: Tuple[int, int]) -> pygame.Rect:
+    def _build_tile(self) -> pygame.Surface:
         container = pygame.Surface((300, 300), pygame.SRCALPHA)
-        
-        if not self.visible:
-            # return None
-            if self.visible_end_time is None:
-                self.visible_end_time = pygame.time.get_ticks()
-            self.visible_end_elapse = pygame.time.get_ticks() - self.visible_end_time
-            if self.visible_end_elapse > 1000:
-                return None
-        
+
         # Draw rectangle
         if self.highlight_good:
             pygame.draw.rect(container, COLORS["darkgreen"], (0, 0, 300, 300), border_radius=10)
@@ -223,33 +687,47 @@ class BallOption:
         
         # Draw border
         pygame.draw.rect(container, COLORS["yellow"], (0, 0, 300, 300), 4, border_radius=10)
+        return container
 
-        # Draw balls
-        for b in self.balls:
-            b.draw(container)
-        
-        # Draw border
+    @staticmethod
+    def _build_border() -> pygame.Surface:
+        container = pygame.Surface((300, 300), pygame.SRCALPHA)
         pygame.draw.rect(container, COLORS["yellow"], (0, 0, 300, 300), 4, border_radius=10)
+        return container
+
+    def draw(self, renderer, position: Tuple[int, int]) -> pygame.Rect:
+        if not self.visible:
+            # return None
+            if self.visible_end_time is None:
+                self.visible_end_time = pygame.time.get_ticks()
+            self.visible_end_elapse = pygame.time.get_ticks() - self.visible_end_time
+            if self.visible_end_elapse > 1000:
+                return None
         
         # Scale and position
         scaled_size = int(300 * self.scale)
-        scaled_img = pygame.transform.smoothscale(container, (scaled_size, scaled_size))        
-        self.rect = scaled_img.get_rect(center=(position[0] + 150, position[1] + 150))
-        surface.blit(scaled_img, self.rect)
+        self.rect = pygame.Rect(0, 0, scaled_size, scaled_size)
+        self.rect.center = (position[0] + 150, position[1] + 150)
+        renderer.draw_cached(("ball_tile", self.highlight_good, self.highlight_bad), self._build_tile, self.rect)
+
+        # Draw balls
+        for b in self.balls:
+            b.draw(renderer, self.rect.topleft, self.scale)
+        
+        # Draw border
+        renderer.draw_cached(("ball_tile_border",), self._build_border, self.rect)
         return self.rect
 
 class MainGame:
     """Main class to manage the Game."""
-    def __init__(self):
+    def __init__(self, trace_latency: bool = False, renderer_backend: str = "surface", voice_pack: Optional[str] = None):
         pygame.init()
 
         # graphics init
         self.screen_width = FULLSCREEN_RESOLUTION[0]
         self.screen_height = FULLSCREEN_RESOLUTION[1]
-        # self.screen = pygame.display.set_mode((self.screen_width, self.screen_height), pygame.FULLSCREEN)
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        pygame.display.set_caption("Game Title")
-        self.fullscreen = self.screen.get_flags() & pygame.FULLSCREEN
+        self.renderer = create_renderer(renderer_backend, (self.screen_width, self.screen_height), "Game Title")
+        self.fullscreen = self.renderer.fullscreen
 
         # fonts init
         self.title_font = pygame.font.Font(None, 48)
@@ -263,6 +741,7 @@ class MainGame:
         self.running = True
         self.game_mode = "menu"
         self.play_welcome_sound = True
+        self.latency_tracer = LatencyTracer() if trace_latency else None
 
         # --- start of game variables ---
 
@@ -273,6 +752,7 @@ class MainGame:
         self.state = GameState()
         self.game_level = 1
         self.max_game_level = MAX_LEVEL
+        self.voice_pack = VoicePack(voice_pack) if voice_pack else None
         self._load_assets()
         self.number_options = 5
         os.makedirs("temp", exist_ok=True)
@@ -294,34 +774,26 @@ class MainGame:
         self.current_music = None
         self.play_music(self.menu_music)
 
-    def _get_audio(self, text: str):
-        filename = f"sfx_{text.replace(" ", "_")}.mp3"
-        if os.path.exists(f"assets/{filename}"):
-            return pygame.mixer.Sound(f"assets/{filename}")
-        else:
-            tts = gTTS(text=text, lang='en')
-            tts.save(f"assets/{filename}")
-            return pygame.mixer.Sound(f"assets/{filename}")
+    def _get_audio(self, phrase_id: str):
+        if self.voice_pack:
+            return pygame.mixer.Sound(self.voice_pack.path(phrase_id))
+        filename = f"assets/sfx_{phrase_id}.mp3"
+        if not os.path.exists(filename):
+            tts = gTTS(text=phrase_catalogue("en")[phrase_id], lang='en')
+            tts.save(filename)
+        return pygame.mixer.Sound(filename)
 
     def _load_assets(self):
+        lang = self.voice_pack.lang if self.voice_pack else "en"
         try:
-            self.sounds = {
-                "point_to": self._get_audio("point to"),
-                "1": [self._get_audio("number one"), self._get_audio("one ball")],
-                "2": [self._get_audio("number two"), self._get_audio("two balls")],
-                "3": [self._get_audio("number three"), self._get_audio("three balls")],
-                "4": [self._get_audio("number four"), self._get_audio("four balls")],
-                "5": [self._get_audio("number five"), self._get_audio("five balls")],
-                "6": [self._get_audio("number six"), self._get_audio("six balls")],
-                "7": [self._get_audio("number seven"), self._get_audio("seven balls")],
-                "8": [self._get_audio("number eight"), self._get_audio("eight balls")],
-                "9": [self._get_audio("number nine"), self._get_audio("nine balls")],
-                "10": [self._get_audio("number ten"), self._get_audio("ten balls")],
-                "good_job": self._get_audio("good job"),
-                "no_good": self._get_audio("no good"),
-                "good": self._get_audio("good"),
-                "you_did_it": self._get_audio("you did it")
-            }
+            self.sounds = {}
+            for phrase_id in phrase_catalogue(lang):
+                # Without a recording the welcome is spoken live, in the pack's language if there is one
+                if phrase_id == "welcome" and not (self.voice_pack and "welcome" in self.voice_pack.manifest["phrases"]):
+                    continue
+                self.sounds[phrase_id] = self._get_audio(phrase_id)
+            for n in NUMBERS:
+                self.sounds[str(n)] = [self.sounds[phrase_id] for phrase_id in number_phrase_ids(n)]
         except FileNotFoundError as e:
             raise SystemExit(f"Missing sound file: {e}")
 
@@ -372,19 +844,30 @@ class MainGame:
         self.state.answered_incorrectly = False
 
     def _handle_input(self):
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        if self.latency_tracer:
+            self.latency_tracer.polled()
+        for event in events:
             if event.type == pygame.QUIT:
                 # self._cleanup()
                 self.running = False
             elif event.type == pygame.KEYDOWN:
                 # Toggle between fullscreen and windowed modes
                 if event.key == pygame.K_RETURN and pygame.key.get_mods() & pygame.KMOD_ALT:
-                    self.fullscreen, self.screen = toggle_fullscreen(self.screen, self.screen_width, self.screen_height, self.fullscreen)
+                    self.fullscreen = self.renderer.toggle_fullscreen()
                 elif event.key == pygame.K_ESCAPE:
                     self.game_mode = "menu"
            
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                pos = event.pos
+            pos = get_press_position(event)
+            if pos is not None:
+                if self.latency_tracer:
+                    self.latency_tracer.begin(event)
+                    if not self.state.is_active:
+                        outcome = "inactive"
+                    elif any(option.rect and option.rect.collidepoint(pos) for option in self.options):
+                        outcome = "ignored"
+                    else:
+                        outcome = "missed"
                 if self.state.is_active:
                     if self.numbers_back_button.is_clicked(pos):
                         self.state = GameState()
@@ -392,6 +875,8 @@ class MainGame:
                     self._handle_game_click(pos)
                 else:
                     self._handle_restart_click(pos)
+                if self.latency_tracer:
+                    self.latency_tracer.end(outcome)
             
             if event.type == pygame.USEREVENT:
                 self._new_round()
@@ -417,6 +902,8 @@ class MainGame:
                         self.state.rounds_played = 0
                     option.visible = False
                     option.highlight_good = True
+                    if self.latency_tracer:
+                        self.latency_tracer.decide()
 
                     # this below starts _new_round()
                     pygame.time.set_timer(pygame.USEREVENT, 1000)
@@ -425,7 +912,8 @@ class MainGame:
                     self.new_sfx = self.sounds["no_good"]
                     self.state.answered_incorrectly = True
                     option.highlight_bad = True
-                    #
+                    if self.latency_tracer:
+                        self.latency_tracer.decide()
 
         # Game ends after 10 rounds
 
@@ -439,7 +927,7 @@ class MainGame:
         self.state.feedback_alpha = min(self.state.feedback_alpha + delta * ANIMATION["feedback_speed"], 1)
         self.state.transition_progress = min(self.state.transition_progress + delta * ANIMATION["transition_speed"], 1)
         for option in self.options:
-            option.update()
+            option.update(delta)
 
     def _process_audio(self):
         if self.new_sfx:
@@ -450,12 +938,12 @@ class MainGame:
             self.new_music = None
     
     def _draw_frame(self):
-        self.screen.fill(COLORS["lightgray"])
+        self.renderer.clear(COLORS["lightgray"])
         
         if self.state.is_active:
             # common screen assets
-            self.screen.blit(self.prompt_text, self.prompt_rect)
-            self.numbers_back_button.draw(self.screen, self.button_font)
+            self.renderer.blit(self.prompt_text, self.prompt_rect)
+            self.numbers_back_button.draw(self.renderer, self.button_font)
 
             self._draw_options()
             self._draw_prompt()
@@ -468,11 +956,13 @@ class MainGame:
             # self._restart_button_rect = self._draw_restart_button()
             self._restart_button_rect = self._draw_next_level_button()
         
-        pygame.display.flip()
+        self.renderer.present()
+        if self.latency_tracer:
+            self.latency_tracer.presented()
 
     def _draw_options(self):
         for i, option in enumerate(self.options):
-            option.draw(self.screen, (100 + i * 350, 300))
+            option.draw(self.renderer, (100 + i * 350, 300))
 
     def _draw_prompt(self):
         prompt_head = ""
@@ -485,13 +975,13 @@ class MainGame:
             prompt_head = "number "
         else:
             prompt_tail = " number and balls"
-        text = self.extra_large_font.render(f"{prompt_head}{NUMBERS.get(self.state.target_number)}{prompt_tail}", True, COLORS["red"])
-        pygame.draw.rect(self.screen, COLORS["darkgray"], text.get_rect(center=(SCREEN_SIZE[0]//2, 100)).inflate(60, 0), border_radius=10)
-        self.screen.blit(text, text.get_rect(center=(SCREEN_SIZE[0]//2, 100)))
+        text = self.renderer.render_text(self.extra_large_font, f"{prompt_head}{NUMBERS.get(self.state.target_number)}{prompt_tail}", COLORS["red"])
+        self.renderer.draw_rect(COLORS["darkgray"], text.get_rect(center=(SCREEN_SIZE[0]//2, 100)).inflate(60, 0), border_radius=10)
+        self.renderer.blit(text, text.get_rect(center=(SCREEN_SIZE[0]//2, 100)))
 
     def _draw_score(self):
-        text = self.normal_font.render(f"Score: {self.state.score}", True, COLORS["white"])
-        self.screen.blit(text, (20, 20))
+        text = self.renderer.render_text(self.normal_font, f"Score: {self.state.score}", COLORS["white"])
+        self.renderer.blit(text, (20, 20))
 
     def _draw_feedback(self):
         if self.state.feedback_text:
@@ -505,12 +995,7 @@ class MainGame:
     def _draw_transition(self, rect: pygame.Rect):
         if self.state.transition_progress < 1:
             alpha = int(self._interpolate(0, 255, self.state.transition_progress))
-            # overlay = pygame.Surface(SCREEN_SIZE, pygame.SRCALPHA)
-            overlay = pygame.Surface(rect.size, pygame.SRCALPHA)
-            print(overlay.get_size())
-            overlay.fill((*COLORS["lightgray"][:3], alpha))
-            # self.screen.blit(overlay, (0, 0))
-            self.screen.blit(overlay, rect.topleft)
+            self.renderer.fill_alpha(COLORS["lightgray"], alpha, rect)
 
     # def _draw_overlay(self):
     #     overlay = pygame.Surface(SCREEN_SIZE, pygame.SRCALPHA)
@@ -519,33 +1004,33 @@ class MainGame:
     #     self.screen.blit(overlay, (0, 0))
 
     def _draw_final_score(self):
-        text = self.normal_font.render(f"Final Score: {self.state.score}", True, COLORS["white"])
-        self.screen.blit(text, text.get_rect(center=(SCREEN_SIZE[0]//2, SCREEN_SIZE[1]//2)))
+        text = self.renderer.render_text(self.normal_font, f"Final Score: {self.state.score}", COLORS["white"])
+        self.renderer.blit(text, text.get_rect(center=(SCREEN_SIZE[0]//2, SCREEN_SIZE[1]//2)))
 
     def _draw_restart_button(self) -> pygame.Rect:
 
         rect = pygame.Rect(0, 0, 400, 120)
         rect.center = (SCREEN_SIZE[0]//2, SCREEN_SIZE[1]//2 + 160)
-        pygame.draw.rect(self.screen, COLORS["green"], rect, border_radius=10)
-        text = self.normal_font.render("Restart", True, COLORS["black"])
-        self.screen.blit(text, text.get_rect(center=rect.center)) # type: ignore
+        self.renderer.draw_rect(COLORS["green"], rect, border_radius=10)
+        text = self.renderer.render_text(self.normal_font, "Restart", COLORS["black"])
+        self.renderer.blit(text, text.get_rect(center=rect.center)) # type: ignore
         return rect
     
     def _draw_next_level_button(self) -> pygame.Rect:
 
         rect = pygame.Rect(0, 0, 400, 120)
         rect.center = (SCREEN_SIZE[0]//2, SCREEN_SIZE[1]//2 + 160)
-        pygame.draw.rect(self.screen, COLORS["green"], rect, border_radius=10)
-        text = self.normal_font.render("Next Level", True, COLORS["black"])
-        self.screen.blit(text, text.get_rect(center=rect.center)) # type: ignore
+        self.renderer.draw_rect(COLORS["green"], rect, border_radius=10)
+        text = self.renderer.render_text(self.normal_font, "Next Level", COLORS["black"])
+        self.renderer.blit(text, text.get_rect(center=rect.center)) # type: ignore
         return rect
 
     def _draw_text_with_background(self, text: str, center: Tuple[int, int], color: Tuple[int, int, int]):
-        text_surf = self.large_font.render(text, True, COLORS["black"])
+        text_surf = self.renderer.render_text(self.large_font, text, COLORS["black"])
         bg_rect = text_surf.get_rect().inflate(40, 20) # type: ignore
         bg_rect.center = center
-        pygame.draw.rect(self.screen, color, bg_rect, border_radius=5)
-        self.screen.blit(text_surf, text_surf.get_rect(center=center))
+        self.renderer.draw_rect(color, bg_rect, border_radius=5)
+        self.renderer.blit(text_surf, text_surf.get_rect(center=center))
 
     @staticmethod
     def _interpolate(a: float, b: float, t: float) -> float:
@@ -575,7 +1060,7 @@ class MainGame:
         self.play_music(self.options_music)
 
         # Prompt text lower left corner
-        prompt_text = self.text_font.render("Hint: Adjust the goal of the game.", True, COLORS["white"])
+        prompt_text = self.renderer.render_text(self.text_font, "Hint: Adjust the goal of the game.", COLORS["white"])
         prompt_rect = prompt_text.get_rect(bottomleft=(20, self.screen_height - 20))
         options_back_button = Button(self.screen_width - 200 - 20, 20, "Back", 200, 50, COLORS["darkred"])
 
@@ -585,18 +1070,6 @@ class MainGame:
 
         while self.game_mode == "options" and self.running:
             self.clock.tick(60)
-            self.screen.fill(COLORS["lightgray"])
-
-            # --- Start of frame creation ---
-
-            self.screen.blit(prompt_text, prompt_rect)
-            options_back_button.draw(self.screen, self.button_font)
-
-            # --- Start of frame creation ---
-
-            # --- End of frame creation ---
-
-            pygame.display.flip()
 
             # --- Event handlers ---
             for event in pygame.event.get():
@@ -605,26 +1078,40 @@ class MainGame:
                 elif event.type == pygame.KEYDOWN:
                     # Toggle between fullscreen and windowed modes
                     if event.key == pygame.K_RETURN and pygame.key.get_mods() & pygame.KMOD_ALT:
-                        self.fullscreen, self.screen = toggle_fullscreen(self.screen, self.screen_width, self.screen_height, self.fullscreen)
+                        self.fullscreen = self.renderer.toggle_fullscreen()
                     elif event.key == pygame.K_ESCAPE:
                             self.game_mode = "menu"
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    x, y = event.pos
-                    if options_back_button.is_clicked(event.pos):
+                elif (pos := get_press_position(event)) is not None:
+                    if options_back_button.is_clicked(pos):
                         self.click_sound.play()
                         self.game_mode = "menu"
 
-    def run_numbers(self):
-        """Handles the words mode loop."""
-        self.play_music(self.colors_music)
-        
+            self.renderer.clear(COLORS["lightgray"])
+
+            # --- Start of frame creation ---
+
+            self.renderer.blit(prompt_text, prompt_rect)
+            options_back_button.draw(self.renderer, self.button_font)
+
+            # --- Start of frame creation ---
+
+            # --- End of frame creation ---
+
+            self.renderer.present()
+
+    def _init_numbers_screen(self):
         # Back button upper right corner
         self.numbers_back_button = Button(self.screen_width - 200 - 20, 20, "Back", 200, 50, COLORS["darkred"])
 
         # Prompt text lower left corner        
-        self.prompt_text = self.text_font.render("Hint: do this and that...", True, COLORS["white"])
+        self.prompt_text = self.renderer.render_text(self.text_font, "Hint: do this and that...", COLORS["white"])
         self.prompt_rect = self.prompt_text.get_rect(bottomleft=(20, self.screen_height - 20))
 
+    def run_numbers(self):
+        """Handles the words mode loop."""
+        self.play_music(self.colors_music)
+        self._init_numbers_screen()
+
         # --- Start of game mode init section ---
 
         # --- End of game mode init section ---
@@ -632,28 +1119,25 @@ class MainGame:
         self._new_round()
         while (self.game_mode == "numbers" or self.game_mode == "balls") and self.running:
             self.clock.tick(60)
-            self.screen.fill(COLORS["lightgray"])
 
             # --- Start of frame creation ---
 
-            self._handle_input()
+            # Input is polled right before drawing so a tap shows up in the very next flip
             self._update_state()
+            self._handle_input()
             self._draw_frame()
             self._process_audio()
-            self.clock.tick(30)
-
-            pygame.display.flip()
 
     def run_menu(self):
         """Handles the main menu loop."""
         self.play_music(self.menu_music)
 
         # Title text top center
-        title_text = self.title_font.render("The Learning Numbers Game", True, COLORS["darkblue"])
+        title_text = self.renderer.render_text(self.title_font, "The Learning Numbers Game", COLORS["darkblue"])
         title_rect = title_text.get_rect(center=(self.screen_width // 2, self.screen_height // 8))
 
         # Prompt text lower left corner
-        prompt_text = self.text_font.render("Hint: Tap or click on a button to start.", True, COLORS["white"])        
+        prompt_text = self.renderer.render_text(self.text_font, "Hint: Tap or click on a button to start.", COLORS["white"])        
         prompt_rect = prompt_text.get_rect(bottomleft=(20, self.screen_height - 20))
 
         # Arrange buttons in a vertical stack centered on screen
@@ -671,23 +1155,48 @@ class MainGame:
         play_menu_sound = False
         while self.game_mode == "menu" and self.running:
             self.clock.tick(60)
-            self.screen.fill(COLORS["lightgray"])
+
+            # Events are handled before drawing so a tap is answered in the very next flip
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_RETURN and pygame.key.get_mods() & pygame.KMOD_ALT:
+                        self.fullscreen = self.renderer.toggle_fullscreen()
+                    elif event.key == pygame.K_ESCAPE or event.key == pygame.K_q:
+                        self.running = False
+                elif (pos := get_press_position(event)) is not None:
+                    if menu_numbers_button.is_clicked(pos):
+                        self.click_sound.play()
+                        self.game_mode = "numbers"
+                    elif menu_balls_button.is_clicked(pos):
+                        self.click_sound.play()
+                        self.game_mode = "balls"
+                    elif menu_quit_button.is_clicked(pos):
+                        self.click_sound.play()
+                        self.running = False
+
+            self.renderer.clear(COLORS["lightgray"])
 
             # Draw title and prompt at the top
-            pygame.draw.rect(self.screen, COLORS["lightyellow"], title_rect.inflate(20, 10))
-            self.screen.blit(title_text, title_rect)
-            self.screen.blit(prompt_text, prompt_rect)
+            self.renderer.draw_rect(COLORS["lightyellow"], title_rect.inflate(20, 10))
+            self.renderer.blit(title_text, title_rect)
+            self.renderer.blit(prompt_text, prompt_rect)
 
             # Draw buttons in center
-            menu_numbers_button.draw(self.screen, self.button_font)
-            menu_balls_button.draw(self.screen, self.button_font)
-            menu_quit_button.draw(self.screen, self.button_font)
+            menu_numbers_button.draw(self.renderer, self.button_font)
+            menu_balls_button.draw(self.renderer, self.button_font)
+            menu_quit_button.draw(self.renderer, self.button_font)
 
-            pygame.display.flip()
+            self.renderer.present()
 
             # Play welcome sound once
             if self.play_welcome_sound:
-                welcome_sound = generate_speech_sound("Welcome to Learning Numbers Game!")
+                if "welcome" in self.sounds:
+                    welcome_sound = self.sounds["welcome"]
+                else:
+                    lang = self.voice_pack.lang if self.voice_pack else "en"
+                    welcome_sound = generate_speech_sound(VOICE_TEXT[lang]["welcome"], lang)
                 welcome_sound.play()
                 self.play_welcome_sound = False
 
@@ -698,25 +1207,6 @@ class MainGame:
                 while pygame.mixer.get_busy():
                     self.clock.tick(10)
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN and pygame.key.get_mods() & pygame.KMOD_ALT:
-                        self.fullscreen, self.screen = toggle_fullscreen(self.screen, self.screen_width, self.screen_height, self.fullscreen)
-                    elif event.key == pygame.K_ESCAPE or event.key == pygame.K_q:
-                        self.running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if menu_numbers_button.is_clicked(event.pos):
-                        self.click_sound.play()
-                        self.game_mode = "numbers"
-                    elif menu_balls_button.is_clicked(event.pos):
-                        self.click_sound.play()
-                        self.game_mode = "balls"
-                    elif menu_quit_button.is_clicked(event.pos):
-                        self.click_sound.play()
-                        self.running = False
-
     def run(self):
         """Main game loop."""
         while self.running:
@@ -729,8 +1219,162 @@ class MainGame:
                 self.game_level = 2
                 self.run_numbers()
             self.clock.tick(60)
+        if self.latency_tracer:
+            print(self.latency_tracer.report())
         pygame.quit()
 
+class SoakTest:
+    """Plays rounds without a player and samples memory use to find growth per round."""
+    def __init__(self, game: MainGame, rounds: int, interval: int):
+        self.game = game
+        self.rounds = rounds
+        self.interval = interval
+        self.samples = []
+        self.first_snapshot = None
+        self.first_types = None
+        self.last_types = None
+        self.trace_filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+
+    def _count_types(self) -> Counter:
+        gc.collect()
+        return Counter(type(o).__name__ for o in gc.get_objects())
+
+    def _frame(self):
+        game = self.game
+        game.clock.tick()
+        game._update_state()
+        game._draw_frame()
+        game._process_audio()
+        # Nobody waits for the sound to finish, and a busy channel would reject the next click
+        game.channel_sfx.stop()
+
+    def _play_round(self):
+        game = self.game
+        self._frame()
+        if game.state.is_active:
+            wrong = [o for o in game.options if o.number != game.state.target_number and o.rect]
+            if wrong and random.random() < 0.5:
+                game._handle_game_click(random.choice(wrong).rect.center)
+                self._frame()
+            correct = next(o for o in game.options if o.number == game.state.target_number)
+            game._handle_game_click(correct.rect.center)
+            self._frame()
+        # Stands in for the USEREVENT timer and the Next Level button
+        pygame.time.set_timer(pygame.USEREVENT, 0)
+        if game.state.is_active:
+            game._new_round()
+        else:
+            game._handle_restart_click(game._restart_button_rect.center)
+
+    def _sample(self, rounds_done: int):
+        types = self._count_types()
+        snapshot = tracemalloc.take_snapshot().filter_traces(self.trace_filters)
+        sample = {
+            "rounds": rounds_done,
+            "traced_kb": sum(trace.size for trace in snapshot.traces) / 1024,
+            "rss_kb": get_rss_kb(),
+            "gc_objects": sum(types.values()),
+            "options": types["NumberOption"] + types["BallOption"],
+            "balls": types["Ball"],
+        }
+        if self.first_snapshot is None:
+            self.first_snapshot = snapshot
+            self.first_types = types
+        self.last_types = types
+        self.samples.append(sample)
+        rss = f"{sample['rss_kb']:10.0f}" if sample["rss_kb"] is not None else f"{'n/a':>10}"
+        print(f"{rounds_done:8d} {sample['traced_kb']:10.1f} {rss} {sample['gc_objects']:10d} {sample['options']:8d} {sample['balls']:6d}")
+
+    @staticmethod
+    def _slope(xs, ys) -> float:
+        mean_x = sum(xs) / len(xs)
+        mean_y = sum(ys) / len(ys)
+        denominator = sum((x - mean_x) ** 2 for x in xs)
+        if not denominator:
+            return 0.0
+        return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / denominator
+
+    def _growth(self, metric: str) -> Optional[Tuple[float, bool]]:
+        """Returns the least-squares growth per round and whether it rose in most intervals, or None without enough samples."""
+        points = [(s["rounds"], s[metric]) for s in self.samples if s[metric] is not None]
+        if len(points) < SOAK_MIN_SAMPLES:
+            return None
+        xs, ys = zip(*points)
+        rises = sum(1 for a, b in zip(ys, ys[1:]) if b > a)
+        return self._slope(xs, ys), rises >= 0.75 * (len(ys) - 1)
+
+    def run(self) -> list:
+        """Plays the rounds, prints a memory report and returns the metrics that grew steadily."""
+        game = self.game
+        game.game_mode = "numbers"
+        game._init_numbers_screen()
+        tracemalloc.start()
+        game._new_round()
+        # Filtering and counting fill pattern and ABC caches; do both once now so that isn't counted as growth
+        tracemalloc.take_snapshot().filter_traces(self.trace_filters)
+        self._count_types()
+
+        print(f"{'rounds':>8} {'traced KB':>10} {'RSS KB':>10} {'gc objects':>10} {'options':>8} {'balls':>6}")
+        # The first interval is a warm-up so caches are full before the first sample
+        for rounds_done in range(1, self.rounds + 1):
+            self._play_round()
+            if rounds_done % self.interval == 0:
+                self._sample(rounds_done)
+
+        flagged = []
+        print("--- Growth per round (samples after warm-up) ---")
+        for metric, limit in SOAK_GROWTH_LIMITS.items():
+            growth = self._growth(metric)
+            if growth is None:
+                print(f"{metric:>12}: not enough samples")
+                continue
+            slope, steady = growth
+            leaking = steady and slope > limit
+            if leaking:
+                flagged.append(metric)
+            print(f"{metric:>12}: {slope:+.4f} per round (limit {limit}){'  <-- STEADY GROWTH' if leaking else ''}")
+
+        if self.first_snapshot is not None:
+            print("--- Largest tracemalloc growth since the first sample ---")
+            last_snapshot = tracemalloc.take_snapshot().filter_traces(self.trace_filters)
+            for stat in last_snapshot.compare_to(self.first_snapshot, "lineno")[:10]:
+                print(stat)
+            print("--- Largest object count growth since the first sample ---")
+            for name, count in (self.last_types - self.first_types).most_common(10):
+                print(f"{count:+8d} {name}")
+        tracemalloc.stop()
+        return flagged
+
 if __name__ == '__main__':
-    game = MainGame()
-    game.run()
+    parser = argparse.ArgumentParser(description="The Learning Numbers Game")
+    parser.add_argument("--trace-latency", action="store_true", help="print tap-to-flip latency histograms on exit")
+    parser.add_argument("--renderer", choices=RENDERER_BACKENDS, default="surface", help="drawing backend; texture-software uses SDL's software renderer")
+    parser.add_argument("--soak", type=int, metavar="ROUNDS", help="play ROUNDS rounds headlessly and report memory growth")
+    parser.add_argument("--soak-interval", type=int, default=500, metavar="ROUNDS", help="rounds between soak memory samples")
+    parser.add_argument("--voice-pack", choices=sorted(VOICE_TEXT), help="speak with the built voice pack for this language")
+    parser.add_argument("--build-voice-packs", nargs="+", choices=sorted(VOICE_TEXT), metavar="LANG", help="build or update the voice packs for these languages and exit")
+    parser.add_argument("--tts-backend", choices=sorted(TTS_BACKENDS), default="gtts", help="speech engine used by --build-voice-packs")
+    parser.add_argument("--jobs", type=int, help="worker processes for --build-voice-packs")
+    args = parser.parse_args()
+    if args.build_voice_packs:
+        summary = build_voice_packs(args.build_voice_packs, args.tts_backend, workers=args.jobs)
+        for lang, counts in summary.items():
+            print(f"{lang}: version {counts['version']}, {counts['built']} built, {counts['kept']} kept, {counts['removed']} removed, {counts['failed']} failed")
+        if any(counts["failed"] for counts in summary.values()):
+            raise SystemExit("Some phrases failed to synthesize, run the build again to retry them")
+    elif args.soak:
+        if args.soak_interval <= 0:
+            parser.error("--soak-interval must be positive")
+        if args.soak // args.soak_interval < SOAK_MIN_SAMPLES:
+            parser.error(f"--soak {args.soak} with --soak-interval {args.soak_interval} gives fewer than {SOAK_MIN_SAMPLES} memory samples")
+        # Headless: no window and no sound device are needed
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        game = MainGame(renderer_backend=args.renderer, voice_pack=args.voice_pack)
+        flagged = SoakTest(game, args.soak, args.soak_interval).run()
+        pygame.quit()
+        if flagged:
+            raise SystemExit(f"Steady growth per round in: {', '.join(flagged)}")
+    else:
+        game = MainGame(trace_latency=args.trace_latency, renderer_backend=args.renderer, voice_pack=args.voice_pack)
+        game.run()
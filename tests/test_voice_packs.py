@@ -0,0 +1,40 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import learning_numbers_game as game
+
+
+def build(root):
+    return game.build_voice_packs(["en", "es"], backend_name="tone", root=str(root), workers=1)
+
+
+def test_rebuild_without_changes_keeps_everything(tmp_path):
+    first = build(tmp_path)
+    second = build(tmp_path)
+    for lang in ("en", "es"):
+        assert second[lang]["built"] == 0
+        assert second[lang]["kept"] == len(game.phrase_catalogue(lang))
+        assert second[lang]["version"] == first[lang]["version"]
+
+
+def test_changed_text_rebuilds_one_phrase(tmp_path, monkeypatch):
+    first = build(tmp_path)
+    monkeypatch.setitem(game.VOICE_TEXT["es"], "good", "¡Muy bien!")
+    second = build(tmp_path)
+    assert second["es"]["built"] == 1
+    assert second["es"]["version"] == first["es"]["version"] + 1
+    assert second["en"]["built"] == 0
+    assert second["en"]["version"] == first["en"]["version"]
+    assert game.VoicePack("es", str(tmp_path)).manifest["phrases"]["good"]["text"] == "¡Muy bien!"
+
+
+def test_phrase_dropped_from_catalogue_is_removed(tmp_path, monkeypatch):
+    build(tmp_path)
+    assert os.path.exists(tmp_path / "es" / "welcome.wav")
+    monkeypatch.setattr(game, "FEEDBACK_PHRASES", tuple(p for p in game.FEEDBACK_PHRASES if p != "welcome"))
+    second = build(tmp_path)
+    assert second["es"]["removed"] == 1
+    assert not os.path.exists(tmp_path / "es" / "welcome.wav")
+    assert "welcome" not in game.VoicePack("es", str(tmp_path)).manifest["phrases"]